@@ -8,22 +8,39 @@ Features:
 - Single-command execution
 - Model selection
 - Connection testing
+- Prompt line editing and history (via readline, where available)
 
 Usage Examples:
   $ python ai.py "Explain quantum computing"
+  $ python ai.py --check "Explain quantum computing" (probe the server first)
   $ python ai.py (interactive mode)
   $ OLLAMA_MODEL=llama2 python ai.py (custom model)
 
 Environment Variables:
   OLLAMA_HOST: API server URL (default: http://localhost:11434)
   OLLAMA_MODEL: Default model name (default: deepseek-r1)
+  OLLAMA_MODELS_CACHE_TTL: Seconds to cache the model list (default: 3600)
+  OLLAMA_KEEP_ALIVE: How long the server keeps the model loaded (default: 30m)
 """
 
+import os
 import sys
-import io
 import locale
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import requests
 from src.ollama.core import ChatModel, list_models_interactive
 
+# readline upgrades input() with line editing and history where available
+try:
+    import readline
+except ImportError:
+    readline = None
+
+HISTORY_FILE = os.path.expanduser("~/.ollama_logs/.history")
+
 # Configure system for UTF-8
 if sys.platform == "win32":
     import ctypes
@@ -31,21 +48,76 @@ if sys.platform == "win32":
     if hasattr(ctypes, 'windll'):
         ctypes.windll.kernel32.SetConsoleOutputCP(65001)
         ctypes.windll.kernel32.SetConsoleCP(65001)
-    # Configure IO wrappers with more robust error handling
-    sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='backslashreplace')
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='backslashreplace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='backslashreplace')
+    # Reconfigure the standard streams once so streamed output never raises
+    for stream in (sys.stdin, sys.stdout, sys.stderr):
+        stream.reconfigure(encoding='utf-8', errors='backslashreplace')
 else:
     # Standard UTF-8 configuration for other platforms
-    sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    for stream in (sys.stdin, sys.stdout, sys.stderr):
+        stream.reconfigure(encoding='utf-8', errors='replace')
     try:
         locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
     except locale.Error:
         pass
 
 
+def load_history() -> None:
+    """Enable readline editing and restore prompt history"""
+    if readline is None:
+        return
+    readline.parse_and_bind("tab: complete")
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+
+def save_history() -> None:
+    """Persist prompt history for the next interactive session"""
+    if readline is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(HISTORY_FILE), exist_ok=True)
+        readline.write_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments
+
+    The prompt is free text, so only a leading ``--check`` is an option;
+    every other word, dash-prefixed or not, is sent as part of the prompt.
+    """
+    args = sys.argv[1:] if argv is None else list(argv)
+    check = bool(args) and args[0] == "--check"
+    return argparse.Namespace(prompt=args[1:] if check else args, check=check)
+
+
+def run_chat_loop(chat_model: ChatModel) -> None:
+    """Read prompts from the terminal and stream replies until the user quits"""
+    # Load the model weights while the user types the first prompt
+    threading.Thread(target=chat_model.warm_up, daemon=True).start()
+    chat_model.start_keepalive()
+
+    print(f"\nOllama Chat - Interactive Mode (Model: {chat_model.model_name})")
+    print("Enter your prompt (or 'quit' to exit):")
+    load_history()
+    try:
+        while True:
+            prompt = input("\n> ")
+            if prompt.lower() in ('quit', 'exit'):
+                break
+            if not prompt.strip():
+                continue
+            try:
+                chat_model.chat(prompt)
+            except requests.exceptions.ConnectionError:
+                print(f"Lost connection to Ollama at {chat_model.ollama_host}")
+    finally:
+        save_history()
+
+
 def main() -> None:
     """Main entry point for the Ollama CLI.
 
@@ -54,36 +126,55 @@ def main() -> None:
 
     Command-line Arguments:
         Optional prompt string to execute in single-command mode
+        --check: Test the connection before a single-command prompt
+            (interactive mode always tests it)
 
     Exit Codes:
         0: Success
         1: Error (connection failed or other exception)
     """
+    args = parse_args()
     try:
-        if len(sys.argv) > 1:
-            prompt = " ".join(sys.argv[1:])
-            chat_model = ChatModel()
-            if not chat_model.test_connection():
-                sys.exit(1)
-            chat_model.chat(prompt)
-        else:
-            chat_model = ChatModel()
-            if not chat_model.test_connection():
-                sys.exit(1)
-            
-            # Allow model selection
-            selected_model = list_models_interactive()
-            if selected_model:
-                chat_model.model_name = selected_model
-            
-            print(f"\nOllama Chat - Interactive Mode (Model: {chat_model.model_name})")
-            print("Enter your prompt (or 'quit' to exit):")
-            while True:
-                prompt = input("\n> ")
-                if prompt.lower() in ('quit', 'exit'):
-                    break
-                if prompt.strip():
-                    chat_model.chat(prompt)
+        # Connection details are only reported in interactive mode
+        with ChatModel.get(verbose=not args.prompt) as chat_model:
+            if args.prompt:
+                prompt = " ".join(args.prompt)
+                # Skip the extra round trip unless asked; chat() surfaces connection errors
+                if args.check and not chat_model.test_connection():
+                    sys.exit(1)
+                chat_model.chat(prompt)
+            else:
+                # Fetch the model list while the connection check is in flight;
+                # a listing error is only worth reporting once the server is up
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    connected = pool.submit(chat_model.test_connection)
+                    models = pool.submit(chat_model.list_models, raise_errors=True)
+                    if not connected.result():
+                        sys.exit(1)
+                    try:
+                        models_data = models.result()
+                    except (requests.exceptions.RequestException, ValueError) as e:
+                        print(f"Error listing models: {e}")
+                        models_data = {"models": []}
+
+                # Allow model selection. get() caches clients per (host, model),
+                # so the selected model gets its own client rather than renaming
+                # this one; it shares this client's already warm connection pool
+                selected_model = list_models_interactive(chat_model, models_data)
+                if selected_model and selected_model != chat_model.model_name:
+                    with ChatModel.get(
+                        chat_model.ollama_host,
+                        selected_model,
+                        session=chat_model.session,
+                        verbose=True,
+                    ) as selected:
+                        run_chat_loop(selected)
+                else:
+                    run_chat_loop(chat_model)
+    except requests.exceptions.ConnectionError:
+        print(f"Could not connect to Ollama at {chat_model.ollama_host}.", file=sys.stderr)
+        print("Make sure Ollama is running, or rerun with --check for diagnostics.", file=sys.stderr)
+        sys.exit(1)
     except KeyboardInterrupt:
         print("\nExiting...")
     except Exception as e:
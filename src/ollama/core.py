@@ -8,9 +8,163 @@ via direct HTTP requests to the Ollama API.
 
 import sys
 import json
+import queue
+import atexit
+import types
+import glob
+import shutil
+from datetime import datetime
+import time
+import asyncio
+import functools
+import threading
 import requests
 import os
-from typing import Dict, List, Any, Optional, Generator
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit, urlunsplit
+from typing import Dict, List, Any, Optional, AsyncGenerator, BinaryIO, Generator, Iterable, Set, Tuple, Union
+
+# orjson works on bytes directly and is several times faster; fall back to stdlib
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# With zstandard installed, rotated logs are kept as compressed archives
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Defaults resolved once at import; OLLAMA_MODEL and OLLAMA_HOST override them
+_DEFAULTS = types.MappingProxyType({
+    "model_name": os.environ.get("OLLAMA_MODEL", "deepseek-r1"),
+    "ollama_host": os.environ.get("OLLAMA_HOST", "http://localhost:11434"),
+    "log_dir": os.path.expanduser("~/.ollama_logs"),
+})
+
+# Directories already created by this process
+_log_dir_ready: Set[str] = set()
+
+# Characters not allowed in log file names
+_SAFE_NAME = str.maketrans({"/": "_", ":": "_"})
+
+# Streamed terminal output is flushed on a newline or once this many
+# characters or seconds accumulate
+_FLUSH_CHARS = 64
+_FLUSH_INTERVAL = 0.05
+
+_GIB = 1 << 30
+
+# Upper bound per read of a streamed body. Ollama streams with chunked
+# transfer encoding, which yields each server flush as soon as it arrives,
+# so a large bound only cuts Python iterations on bursts without adding latency
+_STREAM_CHUNK_SIZE = 65536
+
+# In-process model listings by host, reused for this many seconds so clients
+# created in quick succession skip both the disk cache and the API
+_MODELS_MEMO_TTL = 30.0
+_models_memo: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Queued in place of a message to stop the log writer thread
+_STOP_WRITER = object()
+
+# (connect, read) timeouts for generation calls; a cold model load can take
+# minutes before the first byte, while an unreachable host should fail fast
+_GENERATE_TIMEOUT = (10, 300)
+
+
+def _new_session() -> requests.Session:
+    """Build a keep-alive session with a bounded connection pool"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Compressed bodies are decoded transparently by requests; stream_chat
+    # overrides this with identity so frames are not held back
+    session.headers.update({
+        "Connection": "keep-alive",
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "cmdai/1.0",
+    })
+    return session
+
+
+def _ensure_dir(path: str) -> None:
+    """Create a directory unless this process already did"""
+    if path not in _log_dir_ready:
+        os.makedirs(path, exist_ok=True)
+        _log_dir_ready.add(path)
+
+
+def _parse_jsonl(lines: Iterable[bytes], messages: List[Dict[str, str]]) -> None:
+    """Append each decodable JSON line to messages, skipping corrupt lines"""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            messages.append(_loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+
+def _split_frames(chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+    """Split a byte stream into non-empty newline-delimited frames
+
+    Frames are located by scanning forward from an offset and the consumed
+    prefix is dropped once per chunk rather than once per frame.
+    """
+    buffer = bytearray()
+    for data in chunks:
+        buffer += data
+        start = 0
+        newline = buffer.find(b"\n")
+        while newline != -1:
+            if newline > start:
+                yield bytes(buffer[start:newline])
+            start = newline + 1
+            newline = buffer.find(b"\n", start)
+        if start:
+            del buffer[:start]
+    if buffer.strip():
+        yield bytes(buffer)
+
+
+@functools.lru_cache(maxsize=32)
+def _normalize_host(raw: str) -> str:
+    """Add a missing scheme and default port to a host URL, without trailing slash"""
+    parts = urlsplit(raw if "://" in raw else f"http://{raw}")
+    try:
+        port = parts.port
+    except ValueError as e:
+        raise ValueError(f"Invalid OLLAMA_HOST {raw!r}: {e}") from None
+    netloc = parts.netloc if port is not None else f"{parts.netloc}:11434"
+    return urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment)).rstrip("/")
+
+
+@functools.lru_cache(maxsize=2)
+def _version_probe(session: requests.Session, url: str, fetch_version: bool = True) -> str:
+    """Probe the server once per process; failures are not cached
+
+    Without ``fetch_version`` a bodiless HEAD request is enough, falling back
+    to a GET whose body is never read on servers that do not route HEAD.
+    Returns the server version, or an empty string when it was not fetched.
+    """
+    if fetch_version:
+        response = session.get(url, timeout=5)
+        response.raise_for_status()
+        return response.json().get('version', 'unknown')
+    response = session.head(url, timeout=5)
+    if response.status_code in (404, 405):
+        response = session.get(url, timeout=5, stream=True)
+        response.close()
+    response.raise_for_status()
+    return ""
 
 
 class ChatModel:
@@ -26,61 +180,157 @@ class ChatModel:
         model_name (str): Name of the currently selected model
         ollama_host (str): Base URL for Ollama API
         log_file (str): Path to conversation log file
+        max_log_size (int): Bytes after which the log is rotated
+        max_log_backups (int): Number of rotated logs to keep
         messages (List[Dict[str, str]]): Conversation history
         api_chat (str): Full URL for chat API endpoint
         api_list (str): Full URL for model listing endpoint
+        api_version (str): Full URL for server version endpoint
+        verbose (bool): Whether to report successful connection checks
+        keep_alive (str): Server-side model residency sent with each request
+        max_history (Optional[int]): Most recent messages sent per request,
+            plus a leading system message; None sends the full history,
+            otherwise it must be at least 1 so the prompt itself is sent
+        models_cache_file (str): Path to the cached model listing
+        cache_max_age (float): Seconds a cached model listing stays fresh
+        session (requests.Session): Pooled HTTP session shared by all API calls
     """
-    
+
+    # Open clients handed out by get(), keyed by (normalized host, model name)
+    _instances: Dict[Tuple[str, str], "ChatModel"] = {}
+
     def __init__(
         self,
-        model_name: str = "deepseek-r1",
+        model_name: str = _DEFAULTS["model_name"],
         log_file: Optional[str] = None,
-        ollama_host: str = "http://localhost:11434",
+        ollama_host: str = _DEFAULTS["ollama_host"],
         max_log_size: int = 1_000_000,  # 1MB
         max_log_backups: int = 3,
+        cache_max_age: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+        verbose: bool = False,
+        keep_alive: Optional[str] = None,
+        max_history: Optional[int] = 20,
     ) -> None:
+        if max_history is not None and max_history < 1:
+            raise ValueError(f"max_history must be at least 1 or None, got {max_history}")
         self.model_name: str = model_name
-        self.ollama_host: str = ""
-        self.log_file: str = ""
-        self.messages: List[Dict[str, str]] = []
-        self.api_chat: str = ""
-        self.api_list: str = ""
-        self.api_show: str = ""  # Added for model details endpoint
-        self.model_name = model_name
-        
-        # Process and validate the host URL
-        if not ollama_host.startswith(("http://", "https://")):
-            ollama_host = f"http://{ollama_host}"
-        
-        # Ensure port is specified
-        if ":" not in ollama_host.split("//")[1].split("/")[0]:
-            base_url = ollama_host.split("//")[0] + "//" + ollama_host.split("//")[1].split("/")[0]
-            path = ollama_host[len(base_url):]
-            ollama_host = f"{base_url}:11434{path}"
-        
-        self.ollama_host = ollama_host.rstrip("/")
+        self.verbose: bool = verbose
+        self.max_log_size: int = max_log_size
+        self.max_log_backups: int = max_log_backups
+        self.max_history: Optional[int] = max_history
+        # How long the server keeps model weights loaded after each request
+        if keep_alive is None:
+            keep_alive = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+        self.keep_alive: str = keep_alive
+        self._messages: Optional[List[Dict[str, str]]] = None
+        self._encoded_messages: List[bytes] = []
+
+        # Process and validate the host URL, ensuring scheme and port, then
+        # derive every endpoint from it once
+        self.ollama_host: str = _normalize_host(ollama_host)
+        self.api_chat: str = f"{self.ollama_host}/api/chat"
+        self.api_list: str = f"{self.ollama_host}/api/tags"
+        self.api_show: str = f"{self.ollama_host}/api/show"
+        self.api_version: str = f"{self.ollama_host}/api/version"
 
         # Set up log file path
+        log_dir = _DEFAULTS["log_dir"]
+        self.log_file: str
         if log_file is None:
-            log_dir = os.path.expanduser("~/.ollama_logs")
-            os.makedirs(log_dir, exist_ok=True)
             self.log_file = os.path.join(
                 log_dir,
-                f"{self.model_name.replace('/','_').replace(':','_')}_conversation_log.json"
+                f"{self.model_name.translate(_SAFE_NAME)}_conversation_log.jsonl"
             )
         else:
             self.log_file = log_file
 
-        self.messages = self.load_messages()
-        self.api_chat = f"{self.ollama_host}/api/chat"
-        self.api_list = f"{self.ollama_host}/api/tags"
-        self.api_show = f"{self.ollama_host}/api/show"  # Define the show endpoint URL
+        # Model listing cache, TTL overridable via OLLAMA_MODELS_CACHE_TTL
+        self.models_cache_file: str = os.path.join(log_dir, "models_cache.json")
+        if cache_max_age is None:
+            cache_max_age = float(os.environ.get("OLLAMA_MODELS_CACHE_TTL", 3600))
+        self.cache_max_age: float = cache_max_age
+
+        # Keep-alive session so repeated API calls reuse pooled connections;
+        # a caller-supplied session lets several clients share one pool
+        self._owns_session: bool = session is None
+        self.session: requests.Session = session if session is not None else _new_session()
+
+        # Log writes are queued to a writer thread, started on first use
+        self._log_q: queue.Queue = queue.Queue()
+        self._log_thread: Optional[threading.Thread] = None
+        self._closed: threading.Event = threading.Event()
+
+        # One turn at a time: history and log must stay in user/assistant pairs
+        self._turn_lock: threading.Lock = threading.Lock()
+        self._async_turn_lock: Optional[asyncio.Lock] = None
+        self._async_turn_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """Conversation history, loaded from the log on first access"""
+        if self._messages is None:
+            self._messages = self.load_messages()
+        return self._messages
+
+    @messages.setter
+    def messages(self, value: List[Dict[str, str]]) -> None:
+        self._messages = value
+        self._encoded_messages = []
+
+    @classmethod
+    def get(
+        cls,
+        ollama_host: Optional[str] = None,
+        model_name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "ChatModel":
+        """Return the open client for a host and model, creating it once
+
+        Reusing the client keeps its session pool and loaded history.
+
+        Args:
+            ollama_host: API host; defaults to OLLAMA_HOST
+            model_name: Model name; defaults to OLLAMA_MODEL
+            **kwargs: Extra constructor arguments, used only when a new
+                client is created
+
+        Returns:
+            ChatModel: A client that stays cached until it is closed
+        """
+        host = _normalize_host(ollama_host or _DEFAULTS["ollama_host"])
+        model = model_name or _DEFAULTS["model_name"]
+        instance = cls._instances.get((host, model))
+        if instance is None:
+            instance = cls(model_name=model, ollama_host=host, **kwargs)
+            cls._instances[(host, model)] = instance
+        return instance
+
+    def __enter__(self) -> "ChatModel":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for pending log writes and release pooled connections
+
+        A session passed in by the caller is left open for its owner.
+        """
+        for key, instance in list(ChatModel._instances.items()):
+            if instance is self:
+                del ChatModel._instances[key]
+        self._closed.set()
+        self._stop_log_writer()
+        if self._owns_session:
+            self.session.close()
 
     def test_connection(self) -> bool:
         """Tests connection to the Ollama API server.
 
         Performs a health check by requesting version information from the API.
-        Provides troubleshooting guidance if connection fails.
+        Provides troubleshooting guidance if connection fails; progress
+        messages are printed only when ``verbose`` is set.
 
         Returns:
             bool: True if connection succeeds, False otherwise
@@ -89,17 +339,17 @@ class ChatModel:
             requests.exceptions.RequestException: If network issues occur
         """
         try:
-            test_url = f"{self.ollama_host}/api/version"
-            print(f"Testing connection to: {test_url}")
-            response = requests.get(test_url, timeout=5)
-            if response.status_code == 200:
-                version_info = response.json()
-                print(f"Successfully connected to Ollama. Version: {version_info.get('version', 'unknown')}")
+            if not self.verbose:
+                _version_probe(self.session, self.api_version, fetch_version=False)
                 return True
-            else:
-                print(f"Connection test failed with status code: {response.status_code}")
-                print(f"Response text: {response.text}")
-                return False
+            print(f"Testing connection to: {self.api_version}")
+            version = _version_probe(self.session, self.api_version)
+            print(f"Successfully connected to Ollama. Version: {version}")
+            return True
+        except requests.exceptions.HTTPError as e:
+            print(f"Connection test failed with status code: {e.response.status_code}")
+            print(f"Response text: {e.response.text}")
+            return False
         except requests.exceptions.RequestException as e:
             print(f"Connection test failed: {e}")
             print("\nTroubleshooting tips:")
@@ -109,23 +359,214 @@ class ChatModel:
             return False
 
     def load_messages(self) -> List[Dict[str, str]]:
+        """Load conversation history from the JSONL log, skipping corrupt lines
+
+        Rotated logs are replayed first, oldest first: numbered backups, then
+        compressed archives, which are only written (and readable) when
+        zstandard is installed.
+        """
+        messages: List[Dict[str, str]] = []
+        for backup in self._log_backups():
+            try:
+                with open(backup, "rb") as file:
+                    _parse_jsonl(file, messages)
+            except OSError:
+                continue
+        if zstandard is not None:
+            for archive in self._log_archives():
+                try:
+                    with open(archive, "rb") as file:
+                        data = zstandard.ZstdDecompressor().decompressobj().decompress(file.read())
+                except (OSError, zstandard.ZstdError):
+                    continue
+                _parse_jsonl(data.splitlines(), messages)
         try:
-            with open(self.log_file, "r", encoding='utf-8') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with open(self.log_file, "rb") as file:
+                _parse_jsonl(file, messages)
+        except FileNotFoundError:
+            if not messages:
+                messages = self._import_legacy_log()
+        return messages
+
+    def _import_legacy_log(self) -> List[Dict[str, str]]:
+        """Carry a pre-JSONL ``*_conversation_log.json`` history over, once
+
+        The legacy JSON array is written out as the new JSONL log; the old
+        file is left untouched and ignored from then on.
+        """
+        if not self.log_file.endswith(".jsonl"):
+            return []
+        legacy_file = self.log_file[:-1]
+        try:
+            with open(legacy_file, "rb") as file:
+                data = file.read()
+        except OSError:
             return []
+        try:
+            text = data.decode("utf-8")
         except UnicodeDecodeError:
-            # Fallback method if UTF-8 fails
-            try:
-                with open(self.log_file, "r", encoding='latin-1') as file:
-                    return json.load(file)
-            except:
-                return []
+            text = data.decode("latin-1")
+        try:
+            messages = json.loads(text)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(messages, list):
+            return []
+        try:
+            # Exclusive create: never clobber a log the writer has started
+            with open(self.log_file, "xb") as file:
+                file.write(b"".join(_dumps(message) + b"\n" for message in messages))
+        except OSError:
+            pass
+        return messages
+
+    def _encoded_history(self) -> List[bytes]:
+        """JSON encoding of each history message, extended only with new ones
+
+        History is treated as append-only; a shorter list triggers a rebuild.
+        """
+        encoded = self._encoded_messages
+        messages = self.messages
+        if len(encoded) > len(messages):
+            encoded.clear()
+        encoded.extend(_dumps(message) for message in messages[len(encoded):])
+        return encoded
+
+    def _history_window(self) -> List[bytes]:
+        """Encoded messages to send with the next request
+
+        Keeps the last ``max_history`` messages, starting on a user turn, and
+        always keeps a leading system message.
+        """
+        encoded = self._encoded_history()
+        limit = self.max_history
+        if limit is None or len(encoded) <= limit:
+            return encoded
+        messages = self.messages
+        start = len(encoded) - limit
+        if start < len(messages) and messages[start].get("role") == "assistant":
+            start += 1
+        window = encoded[start:]
+        if messages[0].get("role") == "system":
+            window.insert(0, encoded[0])
+        return window
 
-    def log_messages(self) -> None:
-        """Save current conversation history to log file"""
-        with open(self.log_file, "w", encoding='utf-8') as file:
-            json.dump(self.messages, file, indent=4, ensure_ascii=False)
+    def append_messages(self, new_messages: List[Dict[str, str]]) -> None:
+        """Queue messages for the JSONL log, one JSON document per line
+
+        Writing happens on a background thread so callers never wait on
+        disk I/O; close() blocks until everything queued is written.
+
+        Args:
+            new_messages: Messages not yet persisted
+        """
+        if self._log_thread is None:
+            self._log_thread = threading.Thread(target=self._log_writer, daemon=True)
+            self._log_thread.start()
+            atexit.register(self._stop_log_writer)
+        for message in new_messages:
+            self._log_q.put_nowait(message)
+
+    def _stop_log_writer(self) -> None:
+        """Flush queued messages and stop the writer thread"""
+        if self._log_thread is None:
+            return
+        self._log_q.put_nowait(_STOP_WRITER)
+        self._log_thread.join()
+        self._log_thread = None
+        atexit.unregister(self._stop_log_writer)
+
+    def _log_writer(self) -> None:
+        """Drain the log queue into the log file until told to stop
+
+        The file stays open between writes and everything queued at once is
+        written as one batch. The log is rotated once it grows past
+        ``max_log_size``.
+        """
+        file = None
+        try:
+            while True:
+                message = self._log_q.get()
+                batch = []
+                while message is not _STOP_WRITER:
+                    batch.append(message)
+                    try:
+                        message = self._log_q.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        if file is None:
+                            file = self._open_log()
+                        file.write(b"".join(_dumps(item) + b"\n" for item in batch))
+                        file.flush()
+                        if file.tell() > self.max_log_size:
+                            file.close()
+                            file = None
+                            self._rotate_log()
+                    except OSError as e:
+                        print(f"Error writing conversation log: {e}", file=sys.stderr)
+                        if file is not None:
+                            file.close()
+                            file = None
+                if message is _STOP_WRITER:
+                    return
+        finally:
+            if file is not None:
+                file.close()
+
+    def _open_log(self) -> BinaryIO:
+        """Open the log for appending, creating its directory on first use"""
+        try:
+            return open(self.log_file, "ab")
+        except FileNotFoundError:
+            # Forget the directory in case it was removed after being created
+            log_dir = os.path.dirname(self.log_file) or "."
+            _log_dir_ready.discard(log_dir)
+            _ensure_dir(log_dir)
+            return open(self.log_file, "ab")
+
+    def _rotate_log(self) -> None:
+        """Set the live log aside and start a fresh one
+
+        With zstandard installed the log is compressed into a timestamped
+        ``.zst`` archive; otherwise numbered backups are shifted up by one.
+        Either way at most ``max_log_backups`` old logs are kept.
+        """
+        try:
+            if zstandard is not None:
+                self._archive_log()
+                return
+            for index in range(self.max_log_backups - 1, 0, -1):
+                backup = f"{self.log_file}.{index}"
+                if os.path.exists(backup):
+                    os.replace(backup, f"{self.log_file}.{index + 1}")
+            if self.max_log_backups > 0:
+                os.replace(self.log_file, f"{self.log_file}.1")
+            else:
+                os.remove(self.log_file)
+        except OSError:
+            pass
+
+    def _log_backups(self) -> List[str]:
+        """Numbered backups of this log, oldest first"""
+        backups = (f"{self.log_file}.{index}" for index in range(self.max_log_backups, 0, -1))
+        return [backup for backup in backups if os.path.exists(backup)]
+
+    def _log_archives(self) -> List[str]:
+        """Compressed archives of this log, oldest first"""
+        return sorted(glob.glob(f"{glob.escape(self.log_file)}.*.zst"))
+
+    def _archive_log(self) -> None:
+        """Compress the live log into a new archive and prune old archives"""
+        archive = f"{self.log_file}.{datetime.now():%Y%m%d%H%M%S%f}.zst"
+        with open(self.log_file, "rb") as source, open(archive, "wb") as target:
+            with zstandard.ZstdCompressor(level=3).stream_writer(target) as writer:
+                shutil.copyfileobj(source, writer)
+        os.remove(self.log_file)
+        archives = self._log_archives()
+        for old_archive in archives[:max(len(archives) - self.max_log_backups, 0)]:
+            os.remove(old_archive)
 
     def show_model_details(self, model_name: str) -> Optional[Dict[str, Any]]:
         """Retrieves detailed information about a specific model.
@@ -138,9 +579,9 @@ class ChatModel:
         """
         payload = {"name": model_name}
         try:
-            response = requests.post(self.api_show, json=payload, timeout=10)
+            response = self.session.post(self.api_show, json=payload, timeout=10)
             response.raise_for_status()  # Raises HTTPError for bad responses (e.g., 404 Not Found)
-            return response.json()
+            return _loads(response.content)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 print(f"Error: Model '{model_name}' not found.")
@@ -154,20 +595,144 @@ class ChatModel:
             print(f"Error decoding JSON response for model '{model_name}'.")
             return None
 
-    def list_models(self) -> Dict[str, Any]:
-        """List available Ollama models"""
+    def list_models(self, force: bool = False, raise_errors: bool = False) -> Dict[str, Any]:
+        """List available Ollama models
+
+        Listings are shared in-process per host for a short while. Beyond
+        that the on-disk cache is served while it is younger than
+        ``cache_max_age``. Once stale, the cache is revalidated with a
+        conditional request so an unchanged listing comes back as 304
+        without a body to parse.
+
+        Args:
+            force: Skip both caches and revalidate with the server
+            raise_errors: Raise request and decoding errors instead of
+                printing them and returning an empty listing
+        """
+        now = time.monotonic()
+        if not force:
+            hit = _models_memo.get(self.ollama_host)
+            if hit is not None and now - hit[0] < _MODELS_MEMO_TTL:
+                return hit[1]
+        models_data = self._fetch_models(force, raise_errors)
+        if models_data is None:
+            return {"models": []}
+        _models_memo[self.ollama_host] = (now, models_data)
+        return models_data
+
+    def _fetch_models(self, force: bool, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the model listing from the disk cache or the API, None on error"""
+        cache, age = self._read_models_cache()
+        if cache is not None and age < self.cache_max_age and not force:
+            return cache["data"]
+
+        headers = {}
+        if cache is not None:
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
         try:
-            response = requests.get(self.api_list)
+            response = self.session.get(self.api_list, headers=headers, timeout=10)
+            if response.status_code == 304 and cache is not None:
+                self._touch_models_cache()
+                return cache["data"]
             if response.status_code == 200:
-                return response.json()
+                models_data = _loads(response.content)
+                self._write_models_cache(
+                    models_data,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+                return models_data
             else:
+                if raise_errors:
+                    response.raise_for_status()
                 print(f"Error retrieving models: {response.status_code}")
-                return {"models": []}
+                return None
         except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
             print(f"Request error while listing models: {e}")
-            return {"models": []}
+            return None
+        except json.JSONDecodeError:
+            if raise_errors:
+                raise
+            print("Error decoding JSON response while listing models.")
+            return None
 
-    def stream_chat(self, payload: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+    def _read_models_cache(self) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Return the cached model listing for this host and its age in seconds"""
+        try:
+            age = time.time() - os.path.getmtime(self.models_cache_file)
+            with open(self.models_cache_file, "rb") as file:
+                cache = _loads(file.read())
+        except (OSError, json.JSONDecodeError):
+            return None, 0.0
+        if cache.get("host") != self.ollama_host or "data" not in cache:
+            return None, 0.0
+        return cache, age
+
+    def _write_models_cache(
+        self,
+        models_data: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Atomically replace the model listing cache and its validators"""
+        cache = {
+            "host": self.ollama_host,
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": models_data,
+        }
+        tmp_file = f"{self.models_cache_file}.tmp"
+        try:
+            _ensure_dir(os.path.dirname(self.models_cache_file))
+            with open(tmp_file, "wb") as file:
+                file.write(_dumps(cache))
+            os.replace(tmp_file, self.models_cache_file)
+        except OSError:
+            pass
+
+    def _touch_models_cache(self) -> None:
+        """Mark a revalidated cache as fresh again"""
+        try:
+            os.utime(self.models_cache_file)
+        except OSError:
+            pass
+
+    def warm_up(self) -> None:
+        """Ask the server to load the current model ahead of the first prompt
+
+        An empty chat request only loads the weights; errors are ignored
+        since the next real request reports them anyway.
+        """
+        payload = {"model": self.model_name, "messages": [], "keep_alive": self.keep_alive}
+        try:
+            self.session.post(self.api_chat, json=payload, timeout=_GENERATE_TIMEOUT).close()
+        except requests.exceptions.RequestException:
+            pass
+
+    def start_keepalive(self, interval: float = 25.0) -> None:
+        """Ping the server periodically so pooled connections stay open
+
+        Keeps the connection warm during long pauses between prompts; the
+        daemon thread stops when the client is closed.
+
+        Args:
+            interval: Seconds between pings
+        """
+        def ping() -> None:
+            while not self._closed.wait(interval):
+                try:
+                    self.session.get(self.api_version, timeout=5).close()
+                except requests.exceptions.RequestException:
+                    pass
+
+        threading.Thread(target=ping, daemon=True).start()
+
+    def stream_chat(self, payload: Union[Dict[str, Any], bytes]) -> Generator[Dict[str, Any], None, None]:
         """Stream chat responses from Ollama API
         
         Args:
@@ -175,25 +740,45 @@ class ChatModel:
                 - model: str - Model name
                 - messages: List[Dict[str, str]] - Conversation history
                 - stream: bool - Whether to stream response
+                or the same request already serialized to JSON bytes
         
         Yields:
             Dict[str, Any]: Response chunks from the API
+
+        Raises:
+            requests.exceptions.ConnectionError: If the server is unreachable
         """
         """Stream chat responses from Ollama API"""
+        # Compression would make the server buffer frames, so ask for identity
+        headers = {"Accept-Encoding": "identity"}
+        if isinstance(payload, bytes):
+            headers["Content-Type"] = "application/json"
+            body: Dict[str, Any] = {"data": payload}
+        else:
+            body = {"json": payload}
         try:
-            with requests.post(self.api_chat, json=payload, stream=True, timeout=30) as response:
+            with self.session.post(
+                self.api_chat,
+                stream=True,
+                timeout=_GENERATE_TIMEOUT,
+                headers=headers,
+                **body,
+            ) as response:
                 response.raise_for_status()  # Raises HTTPError for bad responses
                 if response.status_code != 200:
                     print(f"Error: {response.json().get('error', 'Unknown error')}")
                     return
 
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            decoded_line = line.decode('utf-8', errors='replace')
-                            yield json.loads(decoded_line)
-                        except json.JSONDecodeError:
-                            print(f"Error parsing JSON: {line}")
+                # Split NDJSON frames on raw bytes; no per-line str decode
+                chunks = response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)
+                for frame in _split_frames(chunks):
+                    try:
+                        yield _loads(frame)
+                    except json.JSONDecodeError:
+                        print(f"Error parsing JSON: {frame}")
+        except requests.exceptions.ConnectionError:
+            # Let callers decide how to report an unreachable server
+            raise
         except requests.exceptions.RequestException as e:
             print(f"Request error: {e}")
 
@@ -207,38 +792,173 @@ class ChatModel:
             str: Complete response from model
         """
         """Send prompt to model and return response"""
+        turn = self._stream_reply(prompt)
+        self.append_messages(list(turn))
+        return turn[1]["content"]
+
+    async def achat(self, prompt: str) -> str:
+        """Async variant of chat()
+
+        The response is streamed in a worker thread so the event loop stays
+        free; the log write is queued like in chat(). Concurrent calls on one
+        client are answered one turn at a time.
+
+        Args:
+            prompt: User input message
+
+        Returns:
+            str: Complete response from model
+        """
+        async with self._turn_lock_for_loop():
+            turn = await asyncio.to_thread(self._stream_reply, prompt)
+        self.append_messages(list(turn))
+        return turn[1]["content"]
+
+    def _turn_lock_for_loop(self) -> asyncio.Lock:
+        """asyncio lock serializing achat() turns on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._async_turn_lock is None or self._async_turn_loop is not loop:
+            self._async_turn_lock = asyncio.Lock()
+            self._async_turn_loop = loop
+        return self._async_turn_lock
+
+    async def astream_chat(
+        self, payload: Union[Dict[str, Any], bytes]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Async variant of stream_chat()
+
+        Chunks are read by a worker thread on the pooled session and handed
+        to the event loop through a queue as they arrive. Leaving the loop
+        early (break, cancellation) stops the worker and closes the response,
+        which also ends generation on the server.
+
+        Args:
+            payload: Chat request, as accepted by stream_chat()
+
+        Yields:
+            Dict[str, Any]: Response chunks from the API
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def produce() -> None:
+            stream = self.stream_chat(payload)
+            try:
+                for chunk in stream:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            finally:
+                stream.close()  # Exits stream_chat's with block, closing the response
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(chunks.put_nowait, done)
+
+        producer = asyncio.ensure_future(asyncio.to_thread(produce))
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            stop.set()
+        await producer  # Re-raises errors from the worker thread
+
+    async def batch_chat(self, prompts: List[str], concurrency: int = 4) -> List[str]:
+        """Answer independent one-off prompts concurrently
+
+        Prompts are sent without the conversation history, and neither the
+        prompts nor the replies are printed or logged.
+
+        Args:
+            prompts: User input messages
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            List[str]: Complete responses, in prompt order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def answer(prompt: str) -> str:
+            payload = {
+                "model": self.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": True,
+                "keep_alive": self.keep_alive,
+            }
+            parts: List[str] = []
+            async with semaphore:
+                async for chunk in self.astream_chat(payload):
+                    message = chunk.get("message")
+                    content = message.get("content") if message else None
+                    if content:
+                        parts.append(content)
+            return "".join(parts)
+
+        return list(await asyncio.gather(*(answer(prompt) for prompt in prompts)))
+
+    def _stream_reply(self, prompt: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Stream the reply to stdout and record both turns in history
+
+        Returns:
+            The (user_message, model_message) pair added by this turn
+        """
+        with self._turn_lock:
+            return self._stream_turn(prompt)
+
+    def _stream_turn(self, prompt: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Body of _stream_reply(); callers hold the turn lock"""
         user_message = {"role": "user", "content": prompt}
         self.messages.append(user_message)
 
-        payload = {
-            "model": self.model_name,
-            "messages": self.messages,
-            "stream": True
-        }
+        # Splice cached per-message encodings of the recent history instead of
+        # re-encoding it
+        payload = b'{"model":%s,"messages":[%s],"stream":true,"keep_alive":%s}' % (
+            _dumps(self.model_name),
+            b",".join(self._history_window()),
+            _dumps(self.keep_alive),
+        )
 
-        full_response = ""
-        for chunk in self.stream_chat(payload):
-            if "message" in chunk and "content" in chunk["message"]:
-                content = chunk["message"]["content"]
-                try:
-                    # First try printing with default encoding
-                    print(content, end="", flush=True)
-                except UnicodeEncodeError:
-                    try:
-                        # Try Windows-specific encoding
-                        if sys.platform == "win32":
-                            print(content.encode('utf-8').decode('utf-8', 'backslashreplace'), end="", flush=True)
-                        else:
-                            print(content.encode('utf-8', errors='replace').decode('utf-8'), end="", flush=True)
-                    except Exception:
-                        # Ultimate fallback - print raw bytes if all else fails
-                        print(str(content.encode('utf-8', errors='replace')), end="", flush=True)
-                full_response += content
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        # Piped output is read in bulk, so only a terminal gets partial flushes
+        live = sys.stdout.isatty()
+        pending = 0
+        last_flush = time.monotonic()
+        parts: List[str] = []
+        try:
+            for chunk in self.stream_chat(payload):
+                message = chunk.get("message")
+                content = message.get("content") if message else None
+                if not content:
+                    continue
+                write(content)
+                parts.append(content)
+                if not live:
+                    continue
+                pending += len(content)
+                if (
+                    pending >= _FLUSH_CHARS
+                    or "\n" in content
+                    or time.monotonic() - last_flush > _FLUSH_INTERVAL
+                ):
+                    flush()
+                    pending = 0
+                    last_flush = time.monotonic()
+        except requests.exceptions.ConnectionError:
+            # Drop the unanswered prompt so history keeps user/assistant pairs
+            self.messages.pop()
+            del self._encoded_messages[len(self.messages):]
+            raise
+        finally:
+            flush()
+        full_response = "".join(parts)
 
         model_message = {"role": "assistant", "content": full_response}
         self.messages.append(model_message)
-        self.log_messages()
-        return full_response
+        return user_message, model_message
 
 
 def format_model_size(size_bytes: int) -> str:
@@ -251,7 +971,7 @@ def format_model_size(size_bytes: int) -> str:
         str: Formatted size string with 3 decimal places
     """
     """Format bytes to GB string"""
-    return f"{size_bytes/1024/1024/1024:.3f} Gb"
+    return "%.3f Gb" % (size_bytes / _GIB)
 
 
 def format_date(date_str: str) -> str:
@@ -268,25 +988,38 @@ def format_date(date_str: str) -> str:
         return date_str.partition("T")[0]
     return date_str
 
-def list_models_interactive() -> Optional[str]:
+def list_models_interactive(
+    chat_model: Optional[ChatModel] = None,
+    models_data: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
     """Interactive model selection prompt
     
+    Args:
+        chat_model: Existing client to query; a default one is built if omitted
+        models_data: Already fetched model listing; queried if omitted
+
     Returns:
         Optional[str]: Selected model name or None if cancelled
     """
     """List models and prompt for selection, returns chosen model name"""
-    chat_model = ChatModel()
-    models_data = chat_model.list_models()
+    if models_data is None:
+        if chat_model is None:
+            chat_model = ChatModel.get()
+        models_data = chat_model.list_models()
 
     if not models_data.get("models"):
         print("No models found. Please install models first.")
         return None
 
-    print("\nAvailable models:")
-    for i, model in enumerate(models_data["models"], 1):
-        name = model.get("name", "Unknown").partition(":")[0]
-        size = format_model_size(model.get("size", 0)) if "size" in model else "Unknown"
-        print(f"{i}. {name} ({size})")
+    # Build the whole listing first and emit it with a single write
+    fmt_size = format_model_size
+    lines = ["\nAvailable models:"]
+    lines.extend(
+        f"{i}. {model.get('name', 'Unknown').partition(':')[0]} "
+        f"({fmt_size(model['size']) if 'size' in model else 'Unknown'})"
+        for i, model in enumerate(models_data["models"], 1)
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
     while True:
         try:
@@ -28,8 +28,13 @@ class MockChatModel(ChatModel):
             - error: Error case response
     """
     def __init__(self) -> None:
-        super().__init__()
-        self.api_chat = "http://mock-server/api/chat"
+        # A real (never contacted) host and a log that discards writes keep
+        # every inherited method working without network or disk side effects
+        super().__init__(
+            model_name="mock",
+            ollama_host="http://mock-server",
+            log_file=os.devnull,
+        )
         self.test_responses = {
             "success": {"message": {"content": "Mock response"}},
             "error": {"error": "Test error"}
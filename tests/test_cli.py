@@ -0,0 +1,28 @@
+"""Tests for the ai.py command-line interface"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _parse(*argv):
+    # ai.py reconfigures the standard streams on import, so parse in a child
+    code = "import ai; args = ai.parse_args(); print(args.check, args.prompt)"
+    result = subprocess.run(
+        [sys.executable, "-c", code, *argv],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_dash_prefixed_words_stay_in_the_prompt():
+    assert _parse("what", "does", "-v", "do", "in", "grep") == (
+        "False ['what', 'does', '-v', 'do', 'in', 'grep']"
+    )
+    assert _parse("-h") == "False ['-h']"
+
+
+def test_only_a_leading_check_is_an_option():
+    assert _parse("--check", "explain", "--check") == "True ['explain', '--check']"
+    assert _parse() == "False []"
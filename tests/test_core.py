@@ -0,0 +1,357 @@
+"""Tests for the Ollama chat client core"""
+import asyncio
+import json
+import os
+import time
+import types
+
+import pytest
+import requests
+
+from src.ollama import core
+from src.ollama.core import ChatModel, _normalize_host, _split_frames, _version_probe
+
+
+@pytest.fixture
+def chat_model(tmp_path):
+    """ChatModel logging to a temporary directory, never touching the network"""
+    model = ChatModel(
+        model_name="test-model",
+        ollama_host="http://localhost:11434",
+        log_file=str(tmp_path / "test_conversation_log.jsonl"),
+    )
+    model.messages = []
+    yield model
+    model.close()
+
+
+def _read_log(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_concurrent_achat_keeps_turns_paired(chat_model, monkeypatch, capsys):
+    def fake_stream_chat(payload):
+        prompt = json.loads(payload)["messages"][-1]["content"]
+        for word in ("reply", "to", prompt):
+            time.sleep(0.01)
+            yield {"message": {"role": "assistant", "content": word + " "}}
+
+    monkeypatch.setattr(chat_model, "stream_chat", fake_stream_chat)
+
+    async def run():
+        return await asyncio.gather(*(chat_model.achat(f"p{i}") for i in range(5)))
+
+    replies = asyncio.run(run())
+    chat_model.close()
+
+    assert replies == [f"reply to p{i} " for i in range(5)]
+    history = chat_model.messages
+    assert len(history) == 10
+    for user, assistant in zip(history[::2], history[1::2]):
+        assert user["role"] == "user"
+        assert assistant == {"role": "assistant", "content": f"reply to {user['content']} "}
+    assert _read_log(chat_model.log_file) == history
+
+
+def test_mock_chat_model_supports_inherited_methods():
+    from test_ai import MockChatModel
+
+    with MockChatModel() as mock:
+        assert mock.messages == []
+        mock.messages.append({"role": "user", "content": "hi"})
+        assert len(mock._history_window()) == 1
+        mock.append_messages([{"role": "user", "content": "hi"}])
+        assert mock.chat("hi") == "I'm a mock response to 'hi'"
+
+
+def test_astream_chat_break_stops_worker(chat_model, monkeypatch):
+    produced = []
+    closed = []
+
+    def fake_stream_chat(payload):
+        try:
+            for i in range(100):
+                time.sleep(0.01)
+                produced.append(i)
+                yield {"message": {"content": str(i)}}
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(chat_model, "stream_chat", fake_stream_chat)
+
+    async def first_chunk():
+        stream = chat_model.astream_chat({"messages": []})
+        async for chunk in stream:
+            await stream.aclose()
+            return chunk
+
+    assert asyncio.run(first_chunk()) == {"message": {"content": "0"}}
+    assert closed == [True]
+    assert len(produced) < 100
+
+
+def _rotate_and_reload(tmp_path):
+    log_file = str(tmp_path / "rotating_conversation_log.jsonl")
+    turns = [
+        [{"role": "user", "content": f"q{i}"}, {"role": "assistant", "content": f"a{i}" * 20}]
+        for i in range(6)
+    ]
+    with ChatModel(log_file=log_file, max_log_size=100, max_log_backups=10) as model:
+        for turn in turns:
+            model.append_messages(turn)
+            # Drain the writer so each turn is written, and rotated, on its own
+            model._stop_log_writer()
+    with ChatModel(log_file=log_file, max_log_backups=10) as model:
+        return [message for turn in turns for message in turn], model.messages
+
+
+def test_history_survives_rotation_with_numbered_backups(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "zstandard", None)
+    written, reloaded = _rotate_and_reload(tmp_path)
+    assert any(name.endswith(".jsonl.1") for name in os.listdir(tmp_path))
+    assert reloaded == written
+
+
+def test_history_survives_rotation_with_zstandard_archives(tmp_path):
+    pytest.importorskip("zstandard")
+    written, reloaded = _rotate_and_reload(tmp_path)
+    assert any(name.endswith(".zst") for name in os.listdir(tmp_path))
+    assert reloaded == written
+
+
+@pytest.mark.parametrize("max_history", [0, -1])
+def test_max_history_below_one_is_rejected(max_history):
+    with pytest.raises(ValueError):
+        ChatModel(max_history=max_history)
+
+
+def _window(model):
+    return [json.loads(item) for item in model._history_window()]
+
+
+def _turns(count):
+    return [
+        {"role": role, "content": f"{role}{i}"}
+        for i in range(count)
+        for role in ("user", "assistant")
+    ]
+
+
+def test_history_window_does_not_start_on_assistant_turn(chat_model):
+    chat_model.max_history = 4
+    chat_model.messages = _turns(3) + [{"role": "user", "content": "now"}]
+    # The last four messages start with an assistant reply, which is dropped
+    assert _window(chat_model) == chat_model.messages[-3:]
+
+
+def test_history_window_keeps_system_message(chat_model):
+    system = {"role": "system", "content": "be brief"}
+    chat_model.max_history = 3
+    chat_model.messages = [system] + _turns(3) + [{"role": "user", "content": "now"}]
+    assert _window(chat_model) == [system] + chat_model.messages[-3:]
+
+
+def test_history_window_of_one_sends_the_prompt(chat_model):
+    chat_model.max_history = 1
+    chat_model.messages = _turns(2) + [{"role": "user", "content": "now"}]
+    assert _window(chat_model) == [{"role": "user", "content": "now"}]
+
+
+def test_split_frames_joins_frames_split_across_chunks():
+    chunks = [b'{"a":', b'1}\n{"b"', b':2}\n']
+    assert list(_split_frames(chunks)) == [b'{"a":1}', b'{"b":2}']
+
+
+def test_split_frames_skips_blank_lines():
+    chunks = [b"\n", b'{"a":1}\n\n', b"\n", b'{"b":2}\n']
+    assert list(_split_frames(chunks)) == [b'{"a":1}', b'{"b":2}']
+
+
+def test_split_frames_yields_trailing_frame_without_newline():
+    chunks = [b'{"a":1}\n{"b"', b":2}"]
+    assert list(_split_frames(chunks)) == [b'{"a":1}', b'{"b":2}']
+
+
+def test_legacy_json_log_is_imported_once(tmp_path):
+    log_file = tmp_path / "test_conversation_log.jsonl"
+    legacy = [
+        {"role": "user", "content": "héllo"},
+        {"role": "assistant", "content": "hi"},
+    ]
+    (tmp_path / "test_conversation_log.json").write_text(
+        json.dumps(legacy, indent=4, ensure_ascii=False), encoding="utf-8"
+    )
+    with ChatModel(log_file=str(log_file)) as model:
+        assert model.messages == legacy
+        model.append_messages([{"role": "user", "content": "again"}])
+    assert _read_log(log_file) == legacy + [{"role": "user", "content": "again"}]
+    with ChatModel(log_file=str(log_file)) as model:
+        assert model.messages == legacy + [{"role": "user", "content": "again"}]
+
+
+def test_list_models_error_is_printed_or_raised(chat_model, tmp_path, monkeypatch, capsys):
+    def refuse(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("refused")
+
+    chat_model.models_cache_file = str(tmp_path / "models_cache.json")
+    monkeypatch.setattr(chat_model.session, "get", refuse)
+
+    assert chat_model.list_models(force=True) == {"models": []}
+    assert "Request error while listing models" in capsys.readouterr().out
+    with pytest.raises(requests.exceptions.ConnectionError):
+        chat_model.list_models(force=True, raise_errors=True)
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("localhost", "http://localhost:11434"),
+    ("my-server:8080/", "http://my-server:8080"),
+    ("https://example.com", "https://example.com:11434"),
+])
+def test_normalize_host(raw, expected):
+    assert _normalize_host(raw) == expected
+
+
+def test_normalize_host_rejects_non_numeric_port():
+    with pytest.raises(ValueError, match="Invalid OLLAMA_HOST 'localhost:abc'"):
+        _normalize_host("localhost:abc")
+
+
+def test_get_caches_one_client_per_host_and_model():
+    first = ChatModel.get("localhost", "alpha")
+    try:
+        assert ChatModel.get("http://localhost:11434/", "alpha") is first
+        other = ChatModel.get("localhost", "beta")
+        assert other is not first
+        other.close()
+    finally:
+        first.close()
+    assert ChatModel.get("localhost", "alpha") is not first
+    ChatModel.get("localhost", "alpha").close()
+
+
+MODELS = {"models": [{"name": "alpha"}]}
+
+
+@pytest.fixture
+def listing(chat_model, tmp_path, monkeypatch):
+    """chat_model with a private models cache and a recorded, stubbed session.get"""
+    chat_model.models_cache_file = str(tmp_path / "models_cache.json")
+    monkeypatch.setattr(core, "_models_memo", {})
+    requests_sent = []
+    responses = []
+
+    def fake_get(url, headers=None, timeout=None):
+        requests_sent.append(headers or {})
+        status_code, data = responses.pop(0)
+        return types.SimpleNamespace(
+            status_code=status_code,
+            content=json.dumps(data).encode() if data is not None else b"",
+            headers={"ETag": '"v2"', "Last-Modified": "Tue, 02 Jan 2024 00:00:00 GMT"},
+        )
+
+    monkeypatch.setattr(chat_model.session, "get", fake_get)
+    return chat_model, requests_sent, responses
+
+
+def test_fresh_disk_cache_makes_no_request(listing):
+    model, requests_sent, _ = listing
+    model._write_models_cache(MODELS)
+    assert model.list_models() == MODELS
+    assert requests_sent == []
+
+
+def test_stale_disk_cache_is_revalidated_and_304_refreshes_it(listing):
+    model, requests_sent, responses = listing
+    model._write_models_cache(MODELS, '"v1"', "Mon, 01 Jan 2024 00:00:00 GMT")
+    stale = time.time() - model.cache_max_age - 60
+    os.utime(model.models_cache_file, (stale, stale))
+    responses.append((304, None))
+
+    assert model.list_models() == MODELS
+    assert requests_sent == [{
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }]
+    assert os.path.getmtime(model.models_cache_file) > stale + 30
+
+
+def test_memo_hit_skips_disk_cache_and_network(listing):
+    model, requests_sent, responses = listing
+    responses.append((200, MODELS))
+    assert model.list_models() == MODELS
+    os.remove(model.models_cache_file)
+    assert model.list_models() == MODELS
+    assert len(requests_sent) == 1
+
+
+def test_force_bypasses_memo_and_disk_cache(listing):
+    model, requests_sent, responses = listing
+    model._write_models_cache(MODELS)
+    assert model.list_models() == MODELS
+    updated = {"models": [{"name": "beta"}]}
+    responses.append((200, updated))
+
+    assert model.list_models(force=True) == updated
+    assert len(requests_sent) == 1
+    assert model.list_models() == updated
+
+
+class _FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error")
+
+
+class _ProbeSession:
+    """Session stub recording probe requests; HEAD answers from head_statuses"""
+
+    def __init__(self, *head_statuses):
+        self.head_statuses = list(head_statuses)
+        self.calls = []
+        self.responses = []
+
+    def head(self, url, **kwargs):
+        self.calls.append(("HEAD", kwargs))
+        status = self.head_statuses.pop(0)
+        if isinstance(status, Exception):
+            raise status
+        return _FakeResponse(status)
+
+    def get(self, url, **kwargs):
+        self.calls.append(("GET", kwargs))
+        response = _FakeResponse(200)
+        self.responses.append(response)
+        return response
+
+
+@pytest.mark.parametrize("status", [404, 405])
+def test_version_probe_falls_back_to_streamed_get(status):
+    _version_probe.cache_clear()
+    session = _ProbeSession(status)
+    assert _version_probe(session, "http://localhost:11434/api/version", fetch_version=False) == ""
+    assert [method for method, _ in session.calls] == ["HEAD", "GET"]
+    assert session.calls[1][1]["stream"] is True
+    assert session.responses[0].closed
+    _version_probe.cache_clear()
+
+
+def test_version_probe_does_not_cache_failures():
+    _version_probe.cache_clear()
+    session = _ProbeSession(requests.exceptions.ConnectionError("refused"), 200)
+    url = "http://localhost:11434/api/version"
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _version_probe(session, url, fetch_version=False)
+    assert _version_probe(session, url, fetch_version=False) == ""
+    assert _version_probe(session, url, fetch_version=False) == ""
+    assert [method for method, _ in session.calls] == ["HEAD", "HEAD"]
+    _version_probe.cache_clear()